@@ -1,20 +1,43 @@
 """
 Vercel serverless handler for FastAPI app
-This module exports the FastAPI app for Vercel's Python runtime
+This module exports an ASGI entrypoint for Vercel's Python runtime.
+The FastAPI app is imported on the first ASGI event, so the heavy imports
+behind main.py (LangChain, Swiss Ephemeris, Pydantic models) stay off the
+module boot path.
 """
+import logging
 import sys
 import os
 
-# Add parent directory to path so we can import from main.py
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path so we can import from main.py. Appended rather
+# than prepended so stdlib and site-packages imports don't scan it first.
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _APP_ROOT not in sys.path:
+    sys.path.append(_APP_ROOT)
 
-# Import the FastAPI app from main.py
-try:
-    from main import app
-    print("AI Server: Successfully imported app from main.py")
-except Exception as e:
-    print(f"AI Server: Failed to import app from main.py: {e}")
-    # Re-raise so Vercel logs the stack trace
-    raise e
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setLevel(logging.WARNING)
+    logger.addHandler(_handler)
 
+_app = None
 
+
+def _load_app():
+    """Import the FastAPI app from main.py on first use"""
+    global _app
+    try:
+        from main import app as fastapi_app
+    except Exception:
+        logger.exception("AI Server: Failed to import app from main.py")
+        # Re-raise so Vercel marks the invocation as failed
+        raise
+    _app = fastapi_app
+    return _app
+
+
+async def app(scope, receive, send):
+    """ASGI entrypoint that defers importing main.py until it is needed"""
+    fastapi_app = _app or _load_app()
+    await fastapi_app(scope, receive, send)
@@ -3,9 +3,11 @@ FastAPI + LangChain Horoscope Generator (Modular Architecture)
 Main application entry point
 """
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from slowapi.errors import RateLimitExceeded
 
 from src.config.settings import settings
@@ -18,6 +20,7 @@ from src.middleware.error_handler import (
 )
 from src.middleware.rate_limiter import limiter, _rate_limit_exceeded_handler
 from src.services.cache_service import cache_service
+from src.services import ephemeris_service as ephemeris_module
 
 
 @asynccontextmanager
@@ -31,6 +34,11 @@ async def lifespan(app: FastAPI):
     logger.info(f"Cache enabled: {settings.cache_enabled}")
     logger.info(f"Rate limiting enabled: {settings.rate_limit_enabled}")
     
+    # Load ephemeris data once up front so the first chart doesn't pay for it
+    ephemeris_service = ephemeris_module.ephemeris_service
+    if ephemeris_service is not None:
+        ephemeris_service.warm_up()
+    
     yield
     
     # Shutdown
@@ -68,18 +76,28 @@ app.add_exception_handler(Exception, general_exception_handler)
 app.include_router(horoscope_router, tags=["Horoscope"])
 
 
+# The health body never changes, so serialize it once instead of per hit
+_HEALTH_BODY = orjson.dumps(
+    HealthResponse(
+        status="ok",
+        message="Hastrology AI Server is running"
+    ).model_dump(mode="json")
+)
+
+
 @app.get(
     "/",
-    response_model=HealthResponse,
+    # Pre-serialized body, so no response_model validation; the schema is
+    # still advertised in OpenAPI via `responses`
+    response_model=None,
+    response_class=Response,
+    responses={status.HTTP_200_OK: {"model": HealthResponse}},
     summary="Health check",
     description="Check if the API is running"
 )
 async def root():
     """Health check endpoint"""
-    return HealthResponse(
-        status="ok",
-        message="Hastrology AI Server is running"
-    )
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get(
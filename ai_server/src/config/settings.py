@@ -34,6 +34,13 @@ class Settings(BaseSettings):
     # Ephemeris Configuration (Swiss Ephemeris)
     ephemeris_path: str = Field(default="./ephe", alias="EPHEMERIS_PATH")
     ayanamsa: str = Field(default="LAHIRI", alias="AYANAMSA")
+    
+    # Prompt
+    compressed_prompt_enabled: bool = Field(default=False, alias="COMPRESSED_PROMPT_ENABLED")
+    prompt_examples_rate: float = Field(default=1.0, ge=0.0, le=1.0, alias="PROMPT_EXAMPLES_RATE")  # Share of requests sent the examples block
+    
+    # LLM
+    llm_max_concurrency: int = Field(default=8, ge=1, alias="LLM_MAX_CONCURRENCY")  # Gemini calls in flight per process
 
     
     class Config:
@@ -1,20 +1,112 @@
 """
 Request and response Pydantic models
 """
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator
+from typing import Annotated, Optional
+from datetime import date, datetime
 import re
 
 
+# Date of birth shapes, matched directly instead of probing strptime formats
+_ISO_DATE_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")                # 1995-04-20
+_NUMERIC_DATE_RE = re.compile(r"^(\d{1,2})([/\-])(\d{1,2})\2(\d{4})$")      # 20/04/1995, 20-04-1995
+_MONTH_NAME_DATE_RE = re.compile(r"^([A-Za-z]+)\s+(\d{1,2}),\s+(\d{4})$")   # April 20, 1995
+_LOOSE_DATE_RE = re.compile(r"(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})")
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [
+            ("january", "jan"), ("february", "feb"), ("march", "mar"),
+            ("april", "apr"), ("may",), ("june", "jun"),
+            ("july", "jul"), ("august", "aug"), ("september", "sep"),
+            ("october", "oct"), ("november", "nov"), ("december", "dec"),
+        ],
+        start=1
+    )
+    for name in names
+}
+
+
+def _make_date(year: int, month: int, day: int) -> Optional[datetime]:
+    """Build a datetime, or None if the fields don't form a real date"""
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
+def parse_dob(dob: str) -> datetime:
+    """
+    Parse a date of birth string into a datetime.
+    
+    Used by both request validation and horoscope generation, so a date the
+    validator accepts is the same date the service computes the chart for.
+    
+    Raises:
+        ValueError: If no supported date shape matches
+    """
+    value = dob.strip()
+    parsed = None
+    
+    match = _ISO_DATE_RE.match(value)
+    if match:
+        year, month, day = match.groups()
+        parsed = _make_date(int(year), int(month), int(day))
+    
+    if parsed is None:
+        match = _NUMERIC_DATE_RE.match(value)
+        if match:
+            first, separator, second, year = match.groups()
+            # Day first; slashes may also be month first (04/20/1995)
+            parsed = _make_date(int(year), int(second), int(first))
+            if parsed is None and separator == "/":
+                parsed = _make_date(int(year), int(first), int(second))
+    
+    if parsed is None:
+        match = _MONTH_NAME_DATE_RE.match(value)
+        if match:
+            month_name, day, year = match.groups()
+            month = _MONTHS.get(month_name.lower())
+            if month:
+                parsed = _make_date(int(year), month, int(day))
+    
+    if parsed is not None:
+        return parsed
+    
+    # Fallback: try to extract year/month/day with regex
+    match = _LOOSE_DATE_RE.search(dob)
+    if match:
+        day, month, year = match.groups()
+        return datetime(int(year), int(month), int(day))
+    
+    raise ValueError(f"Could not parse date: {dob}")
+
+
+# Stripping and emptiness checks run inside pydantic-core, so these fields need
+# no Python validator callback
+StrippedStr = Annotated[str, StringConstraints(strip_whitespace=True)]
+NonEmptyStrippedStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+
+_HOROSCOPE_REQUEST_EXAMPLE = {
+    "dob": "April 20, 1995",
+    "birth_time": "4:30 PM",
+    "birth_place": "New Delhi, India",
+    "latitude": 28.6139,
+    "longitude": 77.2090,
+    "timezone_offset": 5.5
+}
+
+
 class HoroscopeRequest(BaseModel):
     """
     Request model for horoscope generation.
     Accepts date of birth, birth time, place, and geolocation for topocentric calculations.
     """
-    dob: str = Field(..., description="Date of birth (e.g., 'April 20, 1995' or '1995-04-20')")
-    birth_time: Optional[str] = Field(default="", description="Time of birth (e.g., '4:30 PM' or '16:30')")
-    birth_place: Optional[str] = Field(default="", description="Place of birth (e.g., 'New Delhi, India')")
+    dob: NonEmptyStrippedStr = Field(..., description="Date of birth (e.g., 'April 20, 1995' or '1995-04-20')")
+    birth_time: Optional[StrippedStr] = Field(default="", description="Time of birth (e.g., '4:30 PM' or '16:30')")
+    birth_place: Optional[StrippedStr] = Field(default="", description="Place of birth (e.g., 'New Delhi, India')")
     latitude: float = Field(
         ..., 
         ge=-90, 
@@ -29,6 +121,8 @@ class HoroscopeRequest(BaseModel):
     )
     timezone_offset: Optional[float] = Field(
         default=None,
+        ge=-12,
+        le=14,
         description="UTC offset in hours (e.g., 5.5 for IST). If not provided, will be estimated."
     )
     # X (Twitter) profile context for personalization
@@ -37,51 +131,18 @@ class HoroscopeRequest(BaseModel):
     x_recent_tweets: Optional[list[str]] = Field(default=None, description="User's recent tweets (max 5)")
     x_persona: Optional[str] = Field(default=None, description="Inferred persona type (degen, builder, whale, analyst, etc.)")
     
-    @field_validator('dob')
-    @classmethod
-    def not_empty_dob(cls, v: str) -> str:
-        """Validate that DOB is not empty"""
-        if not v or not v.strip():
-            raise ValueError('Date of birth cannot be empty')
-        return v.strip()
-    
-    @field_validator('birth_time', 'birth_place')
-    @classmethod
-    def allow_empty(cls, v: Optional[str]) -> Optional[str]:
-        """Allow birth time and place to be empty"""
-        if v is None:
-            return ""
-        return v.strip()
-    
     @field_validator('dob')
     @classmethod
     def validate_dob_format(cls, v: str) -> str:
-        """Validate date of birth is parseable"""
-        # Try common formats
-        formats = [
-            "%B %d, %Y",      # April 20, 1995
-            "%b %d, %Y",      # Apr 20, 1995
-            "%Y-%m-%d",       # 1995-04-20
-            "%d/%m/%Y",       # 20/04/1995
-            "%m/%d/%Y",       # 04/20/1995
-        ]
-        for fmt in formats:
-            try:
-                datetime.strptime(v.strip(), fmt)
-                return v.strip()
-            except ValueError:
-                continue
-        # If no format matched, still accept (AI can interpret)
-        return v.strip()
+        """Validate date of birth is parseable and not in the future"""
+        try:
+            parsed = parse_dob(v)
+        except ValueError:
+            # If no format matched, still accept (AI can interpret)
+            return v
+        # Reject here so the request never reaches the ephemeris or the LLM
+        if parsed.date() > date.today():
+            raise ValueError("Date of birth cannot be in the future")
+        return v
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "dob": "April 20, 1995",
-                "birth_time": "4:30 PM",
-                "birth_place": "New Delhi, India",
-                "latitude": 28.6139,
-                "longitude": 77.2090,
-                "timezone_offset": 5.5
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _HOROSCOPE_REQUEST_EXAMPLE})
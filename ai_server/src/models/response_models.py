@@ -1,12 +1,67 @@
 """
 Response Pydantic models - Enhanced for CDO Architecture
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, Dict, Any
 
 
+_HOROSCOPE_RESPONSE_EXAMPLE = {
+    "card": {
+        "front": {
+            "tagline": "Mercury's Got Your Back Today ⚡",
+            "hook_1": "Your 10th house profection activates career themes",
+            "hook_2": "Time to ship that code. Founder mode activated.",
+            "luck_score": 78,
+            "vibe_status": "Ascending",
+            "energy_emoji": "🧠",
+            "zodiac_sign": "Virgo",
+            "time_lord": "Mercury",
+            "profection_house": 10
+        },
+        "back": {
+            "detailed_reading": "With Mercury as your Time Lord this year, your 10th house profection activates career themes. Today's applying trine from Jupiter to Mercury amplifies opportunities for recognition.",
+            "hustle_alpha": "Your communication skills are your superpower today. Pitch that idea.",
+            "shadow_warning": "Mars contrary to sect may trigger impatience. Pause before reacting.",
+            "lucky_assets": {
+                "number": "5",
+                "color": "Emerald",
+                "power_hour": "3:00 PM"
+            },
+            "time_lord_insight": "Mercury, your Year Lord, receives a supportive trine from transiting Jupiter. Expansion in Mercurial matters: writing, learning, deals.",
+            "planetary_blame": "Jupiter trine Mercury (Applying, 2°) - Abundance meets intellect.",
+            "remedy": None,
+            "cusp_alert": None
+        },
+        "ruling_planet": "Mercury",
+        "sect": "Diurnal",
+        "cdo_summary": {
+            "sect": "Diurnal",
+            "ascendant": "Virgo at 16°",
+            "time_lord": "Mercury",
+            "profection_house": 10,
+            "major_aspect": "Jupiter Trine Mercury (Applying)"
+        }
+    },
+    "cached": False,
+    "generation_mode": "cdo"
+}
+
+_HEALTH_RESPONSE_EXAMPLE = {
+    "status": "ok",
+    "message": "Hastrology AI Server is running",
+    "ephemeris_available": True
+}
+
+_ERROR_RESPONSE_EXAMPLE = {
+    "detail": "An error occurred",
+    "error_code": "EPHEMERIS_INIT_FAILED"
+}
+
+
 class LuckyAssets(BaseModel):
     """Lucky assets for the day"""
+    model_config = ConfigDict(frozen=True)
+    
     number: str = Field(..., description="Lucky number")
     color: str = Field(..., description="Lucky color")
     power_hour: str = Field(..., description="Power hour (e.g. '3-4 PM')")
@@ -22,6 +77,8 @@ class LuckyAssets(BaseModel):
 
 class HoroscopeCardFront(BaseModel):
     """Front side of the horoscope card - Public/Shareable"""
+    model_config = ConfigDict(frozen=True)
+    
     tagline: str = Field(..., description="Witty GenZ hook")
     hook_1: str = Field(..., description="Short astrological reason (max 15 words)")
     hook_2: str = Field(..., description="CT-aligned action with persona language (max 20 words)")
@@ -29,12 +86,14 @@ class HoroscopeCardFront(BaseModel):
     vibe_status: str = Field(..., description="Cosmic status (Stellar, Ascending, Shaky, Eclipse)")
     energy_emoji: str = Field(..., description="Emoji representing the energy")
     zodiac_sign: str = Field(..., description="User's Sun sign (based on date of birth)")
-    time_lord: str = Field(..., description="Lord of the Year from profections")
-    profection_house: int = Field(..., ge=1, le=12, description="Current profection house")
+    time_lord: str = Field(default="Sun", description="Lord of the Year from profections")
+    profection_house: int = Field(default=1, ge=1, le=12, description="Current profection house")
 
 
 class HoroscopeCardBack(BaseModel):
     """Back side of the horoscope card - Private Deep-Dive"""
+    model_config = ConfigDict(frozen=True)
+    
     detailed_reading: str = Field(..., description="Deep insight using technical astro terms")
     hustle_alpha: str = Field(..., description="Career/financial advice based on age and profection")
     shadow_warning: str = Field(..., description="Specific precautions based on afflictions")
@@ -42,11 +101,11 @@ class HoroscopeCardBack(BaseModel):
     
     # CDO-Enhanced Fields
     time_lord_insight: str = Field(
-        ..., 
+        default="", 
         description="Insight based on Lord of the Year and their current transits"
     )
     planetary_blame: str = Field(
-        ..., 
+        default="", 
         description="Attribution to specific planetary aspect (e.g., 'Mars squaring your Time Lord Saturn')"
     )
     remedy: Optional[str] = Field(
@@ -61,6 +120,8 @@ class HoroscopeCardBack(BaseModel):
 
 class AstroCard(BaseModel):
     """Complete astro card with front and back - CDO Enhanced"""
+    model_config = ConfigDict(frozen=True)
+    
     front: HoroscopeCardFront = Field(..., description="Front of the card (shareable)")
     back: HoroscopeCardBack = Field(..., description="Back of the card (deep-dive)")
     ruling_planet: str = Field(
@@ -72,18 +133,17 @@ class AstroCard(BaseModel):
         description="The theme of the ruling planet (usually same as ruling_planet)"
     )
     sect: str = Field(
-        ...,
+        default="Diurnal",
         description="Chart sect: Diurnal (day) or Nocturnal (night)"
     )
     cdo_summary: Optional[Dict[str, Any]] = Field(
         default=None,
         description="Cosmic Data Object summary for advanced users/debugging"
     )
-    
-    # For backwards compatibility
-    @property
-    def ruling_planet_theme(self) -> str:
-        return self.ruling_planet
+
+
+# Built once so callers validating card dicts reuse the same validator
+ASTRO_CARD_ADAPTER = TypeAdapter(AstroCard)
 
 
 class HoroscopeResponse(BaseModel):
@@ -95,49 +155,7 @@ class HoroscopeResponse(BaseModel):
         description="Generation mode: 'cdo' for full CDO, 'fallback' if ephemeris unavailable"
     )
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "card": {
-                    "front": {
-                        "tagline": "Mercury's Got Your Back Today ⚡",
-                        "hook_1": "Your 10th house profection activates career themes",
-                        "hook_2": "Time to ship that code. Founder mode activated.",
-                        "luck_score": 78,
-                        "vibe_status": "Ascending",
-                        "energy_emoji": "🧠",
-                        "zodiac_sign": "Virgo",
-                        "time_lord": "Mercury",
-                        "profection_house": 10
-                    },
-                    "back": {
-                        "detailed_reading": "With Mercury as your Time Lord this year, your 10th house profection activates career themes. Today's applying trine from Jupiter to Mercury amplifies opportunities for recognition.",
-                        "hustle_alpha": "Your communication skills are your superpower today. Pitch that idea.",
-                        "shadow_warning": "Mars contrary to sect may trigger impatience. Pause before reacting.",
-                        "lucky_assets": {
-                            "number": "5",
-                            "color": "Emerald",
-                            "power_hour": "3:00 PM"
-                        },
-                        "time_lord_insight": "Mercury, your Year Lord, receives a supportive trine from transiting Jupiter. Expansion in Mercurial matters: writing, learning, deals.",
-                        "planetary_blame": "Jupiter trine Mercury (Applying, 2°) - Abundance meets intellect.",
-                        "remedy": None,
-                        "cusp_alert": None
-                    },
-                    "ruling_planet": "Mercury",
-                    "sect": "Diurnal",
-                    "cdo_summary": {
-                        "sect": "Diurnal",
-                        "ascendant": "Virgo at 16°",
-                        "time_lord": "Mercury",
-                        "profection_house": 10,
-                        "major_aspect": "Jupiter Trine Mercury (Applying)"
-                    }
-                },
-                "cached": False,
-                "generation_mode": "cdo"
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": _HOROSCOPE_RESPONSE_EXAMPLE})
 
 
 class HealthResponse(BaseModel):
@@ -149,14 +167,7 @@ class HealthResponse(BaseModel):
         description="Whether Swiss Ephemeris data files are available"
     )
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "status": "ok",
-                "message": "Hastrology AI Server is running",
-                "ephemeris_available": True
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": _HEALTH_RESPONSE_EXAMPLE})
 
 
 class ErrorResponse(BaseModel):
@@ -164,10 +175,4 @@ class ErrorResponse(BaseModel):
     detail: str = Field(..., description="Error details")
     error_code: Optional[str] = Field(default=None, description="Error code for debugging")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "detail": "An error occurred",
-                "error_code": "EPHEMERIS_INIT_FAILED"
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": _ERROR_RESPONSE_EXAMPLE})
@@ -1,10 +1,12 @@
 """
 API routes for horoscope generation - CDO Enhanced
 """
+import orjson
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import Response
 from ..models.request_models import HoroscopeRequest
-from ..models.response_models import HoroscopeResponse, AstroCard
-from ..services.horoscope_service import horoscope_service
+from ..models.response_models import HoroscopeResponse
+from ..services.horoscope_service import get_horoscope_service
 from ..config.logger import logger
 
 router = APIRouter()
@@ -12,7 +14,12 @@ router = APIRouter()
 
 @router.post(
     "/generate_horoscope",
-    response_model=HoroscopeResponse,
+    # The service returns dumps of already-validated cards, so skip FastAPI's
+    # response_model re-validation and jsonable_encoder pass; the model is
+    # still advertised in the OpenAPI schema via `responses`
+    response_model=None,
+    response_class=Response,
+    responses={status.HTTP_200_OK: {"model": HoroscopeResponse}},
     status_code=status.HTTP_200_OK,
     summary="Generate personalized astro cards with CDO",
     description="Generate high-fidelity horoscope cards using Swiss Ephemeris and Cosmic Data Object architecture"
@@ -35,12 +42,16 @@ async def generate_horoscope(request: HoroscopeRequest):
         HTTPException: If horoscope generation fails
     """
     try:
-        logger.info(f"CDO Horoscope request: DOB={request.dob}, Lat={request.latitude}, Lon={request.longitude}, X=@{request.x_handle}")
+        # %-style args are only formatted if a handler actually emits the record
+        logger.info(
+            "CDO Horoscope request: DOB=%s, Lat=%s, Lon=%s, X=@%s",
+            request.dob, request.latitude, request.longitude, request.x_handle
+        )
         
-        card_data, was_cached, generation_mode = await horoscope_service.generate_horoscope(
+        card_data, was_cached, generation_mode = await get_horoscope_service().generate_horoscope(
             dob=request.dob,
-            birth_time=request.birth_time,
-            birth_place=request.birth_place,
+            birth_time=request.birth_time or "",
+            birth_place=request.birth_place or "",
             latitude=request.latitude,
             longitude=request.longitude,
             timezone_offset=request.timezone_offset or 0.0,
@@ -50,25 +61,27 @@ async def generate_horoscope(request: HoroscopeRequest):
             x_persona=request.x_persona
         )
         
-        # Convert raw card data to AstroCard model
-        card = AstroCard(**card_data)
-        
-        logger.info(f"Generated horoscope (mode={generation_mode}, cached={was_cached})")
+        logger.info("Generated horoscope (mode=%s, cached=%s)", generation_mode, was_cached)
         
-        return HoroscopeResponse(
-            card=card,
-            cached=was_cached,
-            generation_mode=generation_mode
+        # Fresh cards are validated once in the service and cached ones were
+        # validated before being stored, so serialize them as they are
+        return Response(
+            content=orjson.dumps({
+                "card": card_data,
+                "cached": was_cached,
+                "generation_mode": generation_mode
+            }),
+            media_type="application/json"
         )
         
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid input: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Error in generate_horoscope endpoint: {e}")
+        logger.error("Error in generate_horoscope endpoint: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate horoscope: {str(e)}"
@@ -253,33 +253,31 @@ class AstroCalculator:
             List of Aspect objects
         """
         aspects = []
-        planet_names = list(planets.keys())
         
-        for i, planet1 in enumerate(planet_names):
-            for planet2 in planet_names[i+1:]:
-                # Skip nodes for aspect calculations
-                if "Node" in planet1 or "Node" in planet2:
-                    continue
-                
-                pos1 = planets[planet1]
-                pos2 = planets[planet2]
-                
-                # Get longitudes (handle both dict and object)
-                lon1 = pos1.longitude if hasattr(pos1, 'longitude') else pos1.get('longitude', 0)
-                lon2 = pos2.longitude if hasattr(pos2, 'longitude') else pos2.get('longitude', 0)
-                speed1 = pos1.speed if hasattr(pos1, 'speed') else pos1.get('speed', 0)
-                speed2 = pos2.speed if hasattr(pos2, 'speed') else pos2.get('speed', 0)
-                
+        # Read each planet's position once (nodes are skipped for aspects)
+        bodies = []
+        for name, pos in planets.items():
+            if "Node" in name:
+                continue
+            if hasattr(pos, 'longitude'):
+                bodies.append((name, pos.longitude, pos.speed))
+            else:
+                bodies.append((name, pos.get('longitude', 0), pos.get('speed', 0)))
+        
+        aspect_orbs = [
+            (aspect_name, aspect_def["angle"], aspect_def["orb"] * orb_multiplier, aspect_def["nature"])
+            for aspect_name, aspect_def in self.aspect_definitions.items()
+        ]
+        
+        for i, (planet1, lon1, speed1) in enumerate(bodies):
+            for planet2, lon2, speed2 in bodies[i+1:]:
                 # Calculate angular separation
                 diff = abs(lon1 - lon2)
                 if diff > 180:
                     diff = 360 - diff
                 
                 # Check against each aspect type
-                for aspect_name, aspect_def in self.aspect_definitions.items():
-                    angle = aspect_def["angle"]
-                    orb = aspect_def["orb"] * orb_multiplier
-                    
+                for aspect_name, angle, orb, nature in aspect_orbs:
                     if abs(diff - angle) <= orb:
                         # Determine if applying or separating
                         # Applying: faster planet approaching slower one
@@ -293,7 +291,7 @@ class AstroCalculator:
                             aspect_type=aspect_name,
                             orb=round(abs(diff - angle), 2),
                             is_applying=is_applying,
-                            nature=aspect_def["nature"]
+                            nature=nature
                         ))
                         break  # Only one aspect per planet pair
         
@@ -356,6 +354,17 @@ class AstroCalculator:
         natal_tl = natal_planets[time_lord]
         natal_lon = natal_tl.longitude if hasattr(natal_tl, 'longitude') else natal_tl.get('longitude', 0)
         
+        # Resolve each aspect's intensity once rather than per transiting planet
+        aspect_orbs = []
+        for aspect_name, aspect_def in self.aspect_definitions.items():
+            if aspect_name == "conjunction":
+                intensity = "high"
+            elif aspect_name in ["square", "opposition"]:
+                intensity = "challenging"
+            else:
+                intensity = "supportive"
+            aspect_orbs.append((aspect_name, aspect_def["angle"], aspect_def["orb"], intensity))
+        
         for transit_planet, transit_data in transit_planets.items():
             # Skip if same planet
             if transit_planet == time_lord:
@@ -369,19 +378,8 @@ class AstroCalculator:
             if diff > 180:
                 diff = 360 - diff
             
-            for aspect_name, aspect_def in self.aspect_definitions.items():
-                angle = aspect_def["angle"]
-                orb = aspect_def["orb"]
-                
+            for aspect_name, angle, orb, intensity in aspect_orbs:
                 if abs(diff - angle) <= orb:
-                    # Determine intensity based on aspect type
-                    if aspect_name == "conjunction":
-                        intensity = "high"
-                    elif aspect_name in ["square", "opposition"]:
-                        intensity = "challenging"
-                    else:
-                        intensity = "supportive"
-                    
                     # Check if applying
                     is_applying = transit_speed != 0  # Simplified check
                     
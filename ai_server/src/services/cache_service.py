@@ -47,7 +47,20 @@ class CacheService:
         if not self.enabled:
             return None
         
-        key = self._generate_key(dob, birth_time, birth_place)
+        return self.get_by_key(self._generate_key(dob, birth_time, birth_place))
+    
+    def get_by_key(self, key: str) -> Optional[str]:
+        """
+        Get cached entry by a precomputed key if available and not expired
+        
+        Args:
+            key: Cache key (e.g. a hash of the rendered prompt)
+            
+        Returns:
+            Cached text or None
+        """
+        if not self.enabled:
+            return None
         
         if key in self.cache:
             horoscope_text, timestamp = self.cache[key]
@@ -77,7 +90,19 @@ class CacheService:
         if not self.enabled:
             return
         
-        key = self._generate_key(dob, birth_time, birth_place)
+        self.set_by_key(self._generate_key(dob, birth_time, birth_place), horoscope_text)
+    
+    def set_by_key(self, key: str, horoscope_text: str) -> None:
+        """
+        Store an entry under a precomputed key
+        
+        Args:
+            key: Cache key (e.g. a hash of the rendered prompt)
+            horoscope_text: Text to cache
+        """
+        if not self.enabled:
+            return
+        
         self.cache[key] = (horoscope_text, time.time())
         logger.info(f"Cached horoscope for key: {key[:8]}... (total entries: {len(self.cache)})")
     
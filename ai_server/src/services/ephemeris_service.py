@@ -3,9 +3,11 @@ Swiss Ephemeris Service - NASA-grade astronomical calculations
 Uses pyswisseph for high-precision planetary positions with topocentric coordinates
 """
 import os
+import threading
 from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple
+from typing import Collection, Dict, List, Literal, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import json
 
 try:
@@ -26,6 +28,15 @@ AYANAMSA_MAP = {
     "FAGAN_BRADLEY": swe.SIDM_FAGAN_BRADLEY if SWISSEPH_AVAILABLE else 0,
 }
 
+# Julian Day range every body can be computed over, with or without .se1
+# files (the built-in Moshier ephemeris covers 3000 BC - 3000 AD)
+EPHE_START_JD = 625000.5
+EPHE_END_JD = 2816787.5
+
+# Julian Day of 1970-01-01 00:00 UT, for converting datetimes in bulk
+JD_UNIX_EPOCH = 2440587.5
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
 # Planet IDs in Swiss Ephemeris
 PLANET_IDS = {
     "Sun": 0,
@@ -41,15 +52,34 @@ PLANET_IDS = {
     "TrueNode": 11,  # Rahu (North Node)
 }
 
-ZODIAC_SIGNS = [
+ZODIAC_SIGNS = (
     "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
     "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
+)
+
+# (name, id) pairs frozen once so the hot loops iterate a tuple, not dict items
+_PLANETS = tuple(PLANET_IDS.items())
+
+# Bodies used for transits (nodes are skipped)
+_TRANSIT_PLANETS = tuple(
+    (name, planet_id) for name, planet_id in _PLANETS if name != "TrueNode"
+)
+
+# Bodies computed with FLG_TOPOCTR for each calculate_chart topocentric mode.
+# Parallax only matters for the Moon (up to ~1 deg); for the Sun it is under
+# 9" and for the other planets smaller still.
+TOPOCENTRIC_PLANET_IDS = {
+    "auto": frozenset({PLANET_IDS["Moon"]}),
+    "always": frozenset(PLANET_IDS.values()),
+    "never": frozenset(),
+}
 
+TopocentricMode = Literal["auto", "always", "never"]
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class PlanetData:
-    """Raw planetary position data from ephemeris"""
+    """Raw planetary position data from ephemeris (immutable, shared via cache)"""
     planet: str
     longitude: float  # Absolute ecliptic longitude (0-360)
     latitude: float
@@ -58,18 +88,19 @@ class PlanetData:
     sign: str
     sign_degree: float  # Degree within sign (0-30)
     house: int = 1
+    sign_index: int = 0  # Index into ZODIAC_SIGNS (0 = Aries)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ChartData:
-    """Complete chart data from ephemeris calculation"""
+    """Complete chart data from ephemeris calculation (immutable, shared via cache)"""
     julian_day: float
     ascendant: float  # Absolute longitude
     ascendant_sign: str
     ascendant_degree: float  # Degree within sign
     mc: float  # Midheaven longitude
     planets: Dict[str, PlanetData]
-    sun_altitude: float  # For sect determination
+    sun_altitude: Optional[float]  # Only computed with precise_sect
     is_day_chart: bool
     ayanamsa_value: float
 
@@ -91,6 +122,10 @@ class EphemerisService:
         self.initialized = False
         self.using_moshier = False
         self.ayanamsa_name = ayanamsa
+        # Swiss Ephemeris keeps the ephemeris path, sidereal mode and topocentric
+        # observer in process-global state, so every swe call takes this lock
+        self._swe_lock = threading.RLock()
+        self._last_topo: Optional[Tuple[float, float, float]] = None
         
         if not SWISSEPH_AVAILABLE:
             logger.error("pyswisseph not installed. Ephemeris calculations unavailable.")
@@ -100,10 +135,11 @@ class EphemerisService:
         self.ephe_path = ephe_path or settings.ephemeris_path
         if os.path.exists(self.ephe_path):
             swe.set_ephe_path(self.ephe_path)
-            # Check if actual .se1 files exist
-            se1_files = [f for f in os.listdir(self.ephe_path) if f.endswith('.se1')]
-            if se1_files:
-                logger.info(f"Using JPL ephemeris from {self.ephe_path} ({len(se1_files)} files)")
+            # Check if actual .se1 files exist (stop at the first one)
+            with os.scandir(self.ephe_path) as entries:
+                has_se1 = any(entry.name.endswith('.se1') for entry in entries)
+            if has_se1:
+                logger.info(f"Using JPL ephemeris from {self.ephe_path}")
             else:
                 logger.warning(f"No .se1 files in {self.ephe_path}, using Moshier method")
                 self.using_moshier = True
@@ -113,11 +149,38 @@ class EphemerisService:
         
         # Set ayanamsa for sidereal calculations
         ayanamsa_id = AYANAMSA_MAP.get(ayanamsa.upper(), swe.SIDM_LAHIRI)
-        swe.set_sid_mode(ayanamsa_id)
+        with self._swe_lock:
+            swe.set_sid_mode(ayanamsa_id)
+        
+        # calc_ut flags for every (use_sidereal, topocentric) combination,
+        # resolved once so the planet loop only does a lookup
+        self._calc_flags: Dict[Tuple[bool, bool], int] = {
+            (False, False): swe.FLG_SWIEPH,
+            (True, False): swe.FLG_SWIEPH | swe.FLG_SIDEREAL,
+            (False, True): swe.FLG_SWIEPH | swe.FLG_TOPOCTR,
+            (True, True): swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_TOPOCTR,
+        }
         
         self.initialized = True
         logger.info(f"EphemerisService initialized (Sidereal: {ayanamsa})")
     
+    def warm_up(self) -> None:
+        """
+        Touch every planet once so the ephemeris files are opened and their
+        first data blocks read at startup instead of on the first request.
+        """
+        if not self.initialized:
+            return
+        
+        jd = 2451545.0  # J2000.0, inside the same .se1 range as current dates
+        with self._swe_lock:
+            for planet_name, planet_id in _PLANETS:
+                try:
+                    swe.calc_ut(jd, planet_id, swe.FLG_SWIEPH)
+                except Exception as e:
+                    logger.warning(f"Ephemeris warm-up failed for {planet_name}: {e}")
+        logger.info("EphemerisService warmed up")
+    
     def datetime_to_julian(
         self, 
         dt: datetime, 
@@ -147,13 +210,40 @@ class EphemerisService:
         )
         return jd
     
+    def datetimes_to_julian(
+        self,
+        dts: List[datetime],
+        timezone_offset: float = 0.0
+    ) -> List[float]:
+        """
+        Convert many datetimes to Julian Day numbers without calling swe.
+        
+        Uses JD = 2440587.5 + seconds_since_epoch / 86400, which matches
+        datetime_to_julian for whole-second inputs. Like the scalar path,
+        any tzinfo is ignored and timezone_offset is applied instead.
+        
+        Args:
+            dts: Datetime objects (e.g. a transit sweep)
+            timezone_offset: UTC offset in hours (e.g., 5.5 for IST)
+            
+        Returns:
+            Julian Day numbers, in input order
+        """
+        offset_days = JD_UNIX_EPOCH - timezone_offset / 24.0
+        return [
+            (dt.replace(tzinfo=None) - _UNIX_EPOCH).total_seconds() / 86400.0 + offset_days
+            for dt in dts
+        ]
+    
     def calculate_chart(
         self,
         birth_datetime: datetime,
         latitude: float,
         longitude: float,
         timezone_offset: float = 0.0,
-        use_sidereal: bool = False
+        use_sidereal: bool = False,
+        topocentric: TopocentricMode = "auto",
+        precise_sect: bool = False
     ) -> ChartData:
         """
         Calculate complete natal chart with topocentric positions.
@@ -164,6 +254,8 @@ class EphemerisService:
             longitude: Birth place longitude
             timezone_offset: UTC offset in hours
             use_sidereal: Use sidereal zodiac (True for Vedic)
+            topocentric: "auto" = Moon only, "always" = every body, "never" = geocentric
+            precise_sect: Also compute the Sun's true altitude with swe.azalt
             
         Returns:
             ChartData with all planetary positions and chart points
@@ -173,14 +265,57 @@ class EphemerisService:
         
         # Convert to Julian Day
         jd = self.datetime_to_julian(birth_datetime, timezone_offset)
+        self._validate_jd(jd)
         
-        # Set topocentric mode for maximum precision
-        swe.set_topo(longitude, latitude, 0)  # 0 = altitude above sea level
+        # Quantize so repeat charts hit the cache: 1e-6 day is ~0.09s and
+        # 1e-5 deg is ~1m, both far below what the chart can resolve
+        return self._calculate_chart_cached(
+            round(jd, 6),
+            round(latitude, 5),
+            round(longitude, 5),
+            use_sidereal,
+            self.ayanamsa_name,
+            topocentric,
+            precise_sect
+        )
+    
+    @lru_cache(maxsize=4096)
+    def _calculate_chart_cached(
+        self,
+        jd: float,
+        latitude: float,
+        longitude: float,
+        use_sidereal: bool,
+        ayanamsa_name: str,
+        topocentric: TopocentricMode,
+        precise_sect: bool
+    ) -> ChartData:
+        """
+        Calculate the chart for quantized inputs.
         
-        # Calculate flags
-        calc_flags = swe.FLG_SWIEPH | swe.FLG_TOPOCTR
-        if use_sidereal:
-            calc_flags |= swe.FLG_SIDEREAL
+        ayanamsa_name is only part of the cache key; the sidereal mode itself
+        is set once in __init__.
+        """
+        with self._swe_lock:
+            return self._compute_chart(
+                jd, latitude, longitude, use_sidereal, topocentric, precise_sect
+            )
+    
+    def _compute_chart(
+        self,
+        jd: float,
+        latitude: float,
+        longitude: float,
+        use_sidereal: bool,
+        topocentric: TopocentricMode,
+        precise_sect: bool
+    ) -> ChartData:
+        """Run the Swiss Ephemeris calls for one chart (caller holds _swe_lock)"""
+        topocentric_ids = TOPOCENTRIC_PLANET_IDS[topocentric]
+        
+        # Set topocentric observer only for the bodies that need it
+        if topocentric_ids:
+            self._set_topo(longitude, latitude)
         
         # Get ayanamsa value
         ayanamsa_value = swe.get_ayanamsa(jd) if use_sidereal else 0.0
@@ -200,38 +335,25 @@ class EphemerisService:
         ascendant_sign = ZODIAC_SIGNS[asc_sign_index]
         ascendant_degree = ascendant % 30
         
-        # Calculate Sun altitude for sect determination
-        sun_pos = swe.calc_ut(jd, 0, calc_flags)
-        sun_longitude = sun_pos[0][0]
+        # Calculate all planets, with Whole Sign Houses assigned as they are built
+        planets = self._calc_planets(
+            jd, use_sidereal, _PLANETS, topocentric_ids, asc_sign_index
+        )
         
-        # Simple day/night calculation based on Sun position relative to ASC
-        # More accurate: check if Sun is above horizon
-        sun_altitude = self._calculate_altitude(jd, latitude, longitude, sun_longitude)
-        is_day_chart = sun_altitude > 0
+        # Sect: the Ascendant is the ecliptic point on the eastern horizon, so
+        # the Sun (on the ecliptic) is above the horizon exactly when it lies
+        # in the half from the Descendant round to the Ascendant. This needs
+        # no extra swe call and matches azalt's sign in sampled charts.
+        sun = planets["Sun"]
+        is_day_chart = (sun.longitude - ascendant) % 360 >= 180
         
-        # Calculate all planets
-        planets = {}
-        for planet_name, planet_id in PLANET_IDS.items():
-            try:
-                result = swe.calc_ut(jd, planet_id, calc_flags)
-                
-                planet_longitude = result[0][0]
-                sign_index = int(planet_longitude / 30)
-                
-                planets[planet_name] = PlanetData(
-                    planet=planet_name,
-                    longitude=planet_longitude,
-                    latitude=result[0][1],
-                    distance=result[0][2],
-                    speed=result[0][3],
-                    sign=ZODIAC_SIGNS[sign_index],
-                    sign_degree=planet_longitude % 30
-                )
-            except Exception as e:
-                logger.warning(f"Failed to calculate {planet_name}: {e}")
-        
-        # Assign Whole Sign Houses
-        self._assign_whole_sign_houses(planets, asc_sign_index)
+        sun_altitude = None
+        if precise_sect:
+            # azalt wants tropical ecliptic coordinates of date
+            sun_altitude = self._calculate_altitude(
+                jd, latitude, longitude, sun.longitude + ayanamsa_value, sun.latitude
+            )
+            is_day_chart = sun_altitude > 0
         
         return ChartData(
             julian_day=jd,
@@ -245,47 +367,110 @@ class EphemerisService:
             ayanamsa_value=ayanamsa_value
         )
     
+    def _set_topo(self, longitude: float, latitude: float) -> None:
+        """
+        Point swe at the observer, skipping the call when it is already there.
+        Caller holds _swe_lock.
+        """
+        topo = (longitude, latitude, 0)  # 0 = altitude above sea level
+        if topo != self._last_topo:
+            swe.set_topo(*topo)
+            self._last_topo = topo
+    
+    def _validate_jd(self, jd: float) -> None:
+        """
+        Check a Julian Day once before computing planets for it.
+        
+        Raises:
+            ValueError: If jd is outside the range the ephemeris covers
+        """
+        if not EPHE_START_JD <= jd <= EPHE_END_JD:
+            raise ValueError(
+                f"Julian Day {jd} outside supported ephemeris range "
+                f"({EPHE_START_JD} - {EPHE_END_JD})"
+            )
+    
+    def _calc_planets(
+        self,
+        jd: float,
+        use_sidereal: bool,
+        planets_to_calc: Tuple[Tuple[str, int], ...],
+        topocentric_ids: Collection[int] = frozenset(),
+        asc_sign_index: Optional[int] = None
+    ) -> Dict[str, PlanetData]:
+        """
+        Calculate positions for a set of bodies at one Julian Day.
+        
+        Shared by natal charts and transits so both go through a single
+        calc_ut pass with the precomputed flags. Bodies in topocentric_ids
+        additionally get FLG_TOPOCTR (set_topo must be set).
+        
+        When asc_sign_index is given, each body's Whole Sign House is set at
+        construction (House 1 = Ascendant sign, houses follow in zodiacal
+        order), since PlanetData is frozen.
+        
+        The caller validates jd first (_validate_jd), so a calc_ut error
+        propagates instead of silently dropping the body from the chart.
+        
+        Returns:
+            Dictionary of planet name to PlanetData
+        """
+        calc_flags = self._calc_flags[(use_sidereal, False)]
+        topo_flags = self._calc_flags[(use_sidereal, True)]
+        planets = {}
+        for planet_name, planet_id in planets_to_calc:
+            flags = topo_flags if planet_id in topocentric_ids else calc_flags
+            result = swe.calc_ut(jd, planet_id, flags)
+            
+            planet_longitude = result[0][0]
+            sign_index = int(planet_longitude / 30)
+            # Calculate house as offset from Ascendant sign
+            house = (
+                ((sign_index - asc_sign_index) % 12) + 1
+                if asc_sign_index is not None else 1
+            )
+            
+            planets[planet_name] = PlanetData(
+                planet=planet_name,
+                longitude=planet_longitude,
+                latitude=result[0][1],
+                distance=result[0][2],
+                speed=result[0][3],
+                sign=ZODIAC_SIGNS[sign_index],
+                sign_degree=planet_longitude % 30,
+                house=house,
+                sign_index=sign_index
+            )
+        
+        return planets
+    
     def _calculate_altitude(
         self, 
         jd: float, 
         lat: float, 
         lon: float, 
-        sun_longitude: float
+        sun_longitude: float,
+        sun_latitude: float = 0.0
     ) -> float:
         """
         Calculate the altitude of the Sun above the horizon.
-        Simplified calculation for sect determination.
+        Used for sect determination when precise_sect is requested.
         """
         try:
             # Use Swiss Ephemeris azalt function for accurate altitude
             result = swe.azalt(
                 jd, 
-                swe.CALC_SET, 
+                swe.ECL2HOR, 
                 [lon, lat, 0],  # geopos
                 0,  # atpress (atmospheric pressure)
                 0,  # attemp (temperature)
-                [sun_longitude, 0, 1]  # xin (ecliptic position)
+                [sun_longitude, sun_latitude, 1]  # xin (ecliptic position)
             )
             return result[1]  # Altitude in degrees
         except:
             # Fallback: rough estimate based on ascendant distance
             return 0.0
     
-    def _assign_whole_sign_houses(
-        self, 
-        planets: Dict[str, PlanetData], 
-        asc_sign_index: int
-    ) -> None:
-        """
-        Assign Whole Sign House numbers to planets.
-        House 1 = Ascendant sign, houses follow in zodiacal order.
-        """
-        for planet_name, planet_data in planets.items():
-            planet_sign_index = ZODIAC_SIGNS.index(planet_data.sign)
-            # Calculate house as offset from Ascendant sign
-            house = ((planet_sign_index - asc_sign_index) % 12) + 1
-            planet_data.house = house
-    
     def get_current_transits(
         self,
         current_datetime: datetime,
@@ -304,57 +489,56 @@ class EphemerisService:
             timezone_offset: UTC offset in hours
             
         Returns:
-            Dictionary of current planetary positions
+            Dictionary of current planetary positions (shared, do not mutate)
         """
         if not self.initialized:
             raise RuntimeError("EphemerisService not initialized")
         
-        jd = self.datetime_to_julian(current_datetime, timezone_offset)
-        
-        calc_flags = swe.FLG_SWIEPH
-        # Add sidereal flag ONLY if requested
-        # For now, let's make transits match the system default (Tropical)
-        # by removing the hardcoded FLG_SIDEREAL if use_sidereal is False
-        # But wait, this method doesn't take use_sidereal. 
-        # I'll add the parameter or just remove the flag if it should be global.
+        # Transits are geocentric, so latitude/longitude don't affect them.
+        # Bucketing to the minute lets every request in that minute share
+        # one calculation (the Moon moves well under 1' per minute).
+        current_minute = current_datetime.replace(second=0, microsecond=0)
+        jd = self.datetime_to_julian(current_minute, timezone_offset)
+        self._validate_jd(jd)
         
-        # Let's add a parameter for consistency
-        
-        if use_sidereal:
-            calc_flags |= swe.FLG_SIDEREAL
-
-        transits = {}
-        for planet_name, planet_id in PLANET_IDS.items():
-            if planet_name == "TrueNode":
-                continue  # Skip nodes for transits
-            try:
-                result = swe.calc_ut(jd, planet_id, calc_flags)
-                planet_longitude = result[0][0]
-                sign_index = int(planet_longitude / 30)
-                
-                transits[planet_name] = PlanetData(
-                    planet=planet_name,
-                    longitude=planet_longitude,
-                    latitude=result[0][1],
-                    distance=result[0][2],
-                    speed=result[0][3],
-                    sign=ZODIAC_SIGNS[sign_index],
-                    sign_degree=planet_longitude % 30
-                )
-            except Exception as e:
-                logger.warning(f"Failed to calculate transit for {planet_name}: {e}")
-        
-        return transits
+        return self._calculate_transits_cached(round(jd, 6), use_sidereal)
+    
+    @lru_cache(maxsize=64)
+    def _calculate_transits_cached(
+        self,
+        jd: float,
+        use_sidereal: bool
+    ) -> Dict[str, PlanetData]:
+        """Calculate geocentric transit positions for a minute-bucketed Julian Day"""
+        with self._swe_lock:
+            return self._calc_planets(jd, use_sidereal, _TRANSIT_PLANETS)
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized charts and transits"""
+        self._calculate_chart_cached.cache_clear()
+        self._calculate_transits_cached.cache_clear()
     
     def close(self):
         """Clean up Swiss Ephemeris resources"""
         if SWISSEPH_AVAILABLE:
-            swe.close()
+            with self._swe_lock:
+                swe.close()
+                self._last_topo = None
             logger.info("EphemerisService closed")
 
 
-# Global instance
-ephemeris_service = EphemerisService(
-    ephe_path=settings.ephemeris_path if SWISSEPH_AVAILABLE else None,
-    ayanamsa=settings.ayanamsa if SWISSEPH_AVAILABLE else "LAHIRI"
-) if SWISSEPH_AVAILABLE else None
+# Global instance, created on first access (PEP 562) so importing the
+# dataclasses and constants doesn't touch the filesystem or swe state
+_ephemeris_service: Optional[EphemerisService] = None
+
+
+def __getattr__(name: str):
+    global _ephemeris_service
+    if name == "ephemeris_service":
+        if _ephemeris_service is None and SWISSEPH_AVAILABLE:
+            _ephemeris_service = EphemerisService(
+                ephe_path=settings.ephemeris_path,
+                ayanamsa=settings.ayanamsa
+            )
+        return _ephemeris_service
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,27 +2,44 @@
 Horoscope Service - CDO Architecture
 High-fidelity horoscope generation using Swiss Ephemeris and Cosmic Data Object
 """
+import asyncio
+import bisect
+import copy
+import hashlib
+import itertools
 import json
 import re
-from datetime import datetime, date
+import orjson
+from datetime import datetime, date, timezone
+from functools import cached_property, lru_cache
 from typing import Optional, Dict, Any, Tuple
 
-from pydantic import BaseModel, Field
-
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.output_parsers.format_instructions import JSON_FORMAT_INSTRUCTIONS
 from langchain_core.exceptions import OutputParserException
 
 from ..config.settings import settings
 from ..config.logger import logger
 from .cache_service import cache_service
+from ..models.request_models import parse_dob
+from ..models.response_models import (
+    ASTRO_CARD_ADAPTER,
+    AstroCard,
+    HoroscopeCardFront,
+    HoroscopeCardBack
+)
 from ..prompts.senior_astrologer_prompt import (
-    SENIOR_ASTROLOGER_PROMPT, 
-    calculate_vibe_status, 
-    SENIOR_ASTROLOGER_PROMPT, 
-    calculate_vibe_status, 
-    get_energy_emoji
+    SENIOR_ASTROLOGER_PROMPT,
+    PERSONA_TABLES,
+    FULL_PERSONA_TABLE,
+    EXAMPLES_BLOCK,
+    render_prompt
+)
+from ..prompts.compressed_prompt import (
+    SENIOR_ASTROLOGER_PROMPT_MIN,
+    PERSONA_TABLES_MIN,
+    FULL_PERSONA_TABLE_MIN,
+    EXAMPLES_BLOCK_MIN
 )
 from pathlib import Path
 import random
@@ -42,57 +59,198 @@ except Exception as e:
         "bearish_moods": [{"mood": "Bad", "emoji": "👎"}]
     }
 
+# Asset lists for the prompt only change with the mapping file, so join them once
+AVAILABLE_COLORS_STR = ", ".join(ASSET_MAPPINGS.get("colors_to_tickers", {}))
+BULLISH_MOODS_STR = ", ".join(f"{m['mood']} {m['emoji']}" for m in ASSET_MAPPINGS.get("bullish_moods", []))
+BEARISH_MOODS_STR = ", ".join(f"{m['mood']} {m['emoji']}" for m in ASSET_MAPPINGS.get("bearish_moods", []))
+
+# Colour keys for random fallback picks, materialized once
+_COLOR_KEYS = tuple(ASSET_MAPPINGS.get("colors_to_tickers", {}))
+
+# Number of pre-rolled lucky asset sets the fallback card cycles through
+LUCKY_POOL_SIZE = 32
+
+# Most distinct charts whose CDO is memoised within one transit minute
+CDO_MEMO_SIZE = 256
+
+# Lowercased colour -> canonical mapping key, for case-insensitive matching
+_COLORS_LOWER_INDEX = {k.lower(): k for k in ASSET_MAPPINGS.get("colors_to_tickers", {})}
+
+
+def _strip_schema_titles(schema: Any) -> Any:
+    """Drop the auto-generated "title" keys, which only repeat the field names"""
+    if isinstance(schema, dict):
+        return {
+            key: (
+                {name: _strip_schema_titles(prop) for name, prop in value.items()}
+                if key in ("properties", "$defs") else _strip_schema_titles(value)
+            )
+            for key, value in schema.items()
+            if key != "title"
+        }
+    if isinstance(schema, list):
+        return [_strip_schema_titles(item) for item in schema]
+    return schema
 
-# Try to import ephemeris services (optional - falls back gracefully)
-try:
-    from .ephemeris_service import ephemeris_service, SWISSEPH_AVAILABLE
-    from .astro_calculator import astro_calculator
-    CDO_ENABLED = SWISSEPH_AVAILABLE and ephemeris_service is not None
-except ImportError as e:
-    logger.warning(f"Ephemeris services not available: {e}")
-    CDO_ENABLED = False
-    ephemeris_service = None
-    astro_calculator = None
+
+# The card schema only changes with the model, so the format instructions are
+# built once, minified and without titles, instead of per parser instance
+FORMAT_INSTRUCTIONS = JSON_FORMAT_INSTRUCTIONS.format(
+    schema=json.dumps(
+        _strip_schema_titles(AstroCard.model_json_schema()),
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+)
+
+# Links and whitespace runs in bios and tweets cost tokens but carry no
+# signal for the reading
+_URL_RE = re.compile(r"https?://\S+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _squeeze_text(text: str) -> str:
+    """Strip links and collapse whitespace in user-supplied X text"""
+    return _WHITESPACE_RE.sub(" ", _URL_RE.sub("", text)).strip()
 
 
-# --- Pydantic Models for Strict Schema Enforcement ---
+# Birth time "4:30 PM" / "16:30"; only the start is anchored so trailing text
+# like seconds or a zone ("16:30:00", "4:30 PM IST") is ignored
+_TIME_RE = re.compile(r"\s*(\d{1,2}):(\d{2})\s*(AM|PM|am|pm)?")
 
-class LuckyAssets(BaseModel):
-    number: str = Field(..., description="Lucky number or special time like 11:11")
-    color: str = Field(..., description="A descriptive color name")
-    power_hour: str = Field(..., description="A specific time of day")
+# Characters that matter when scanning LLM output for a balanced {...} object
+_JSON_SCAN_RE = re.compile(r'[{}"\\]')
+
+
+# CDO fields left out of the prompt JSON: Key Data already states them, or
+# they restate other fields (degree = sign + sign_degree; speed only feeds
+# is_retrograde; is_day_chart = sect)
+_CDO_PROMPT_EXCLUDE = {
+    "time_lord": True,
+    "profection_house": True,
+    "profection_theme": True,
+    "ascendant_sign": True,
+    "ascendant_degree": True,
+    "is_cusp_ascendant": True,
+    "sect": {"sect", "is_day_chart", "malefic_severity"},
+    "planets": {"__all__": {"degree", "speed"}},
+}
+
+# Life stage by age: _AGE_SEGMENTS[i] covers ages below _AGE_BREAKS[i]
+_AGE_BREAKS = (25, 35, 50)
+_AGE_SEGMENTS = (
+    "EARLY_HUSTLE (Growth & Exploration)",
+    "PIVOT_ERA (Career Building & Relationships)",
+    "LEGACY_MODE (Stability & Leadership)",
+    "WISDOM_ERA (Reflection & Mentorship)",
+)
 
+# Tropical sign by (month, day) for fallback mode, built from each month's
+# (first day of the next sign, that sign)
+_ZODIAC_CUTOFFS = (
+    (20, "Aquarius"), (19, "Pisces"), (21, "Aries"), (20, "Taurus"),
+    (21, "Gemini"), (21, "Cancer"), (23, "Leo"), (23, "Virgo"),
+    (23, "Libra"), (23, "Scorpio"), (22, "Sagittarius"), (22, "Capricorn"),
+)
+_ZODIAC_BY_MONTH_DAY = {
+    (month, day): sign if day >= cutoff else _ZODIAC_CUTOFFS[month - 2][1]
+    for month, (cutoff, sign) in enumerate(_ZODIAC_CUTOFFS, start=1)
+    for day in range(1, 32)
+}
 
-class HoroscopeFront(BaseModel):
-    tagline: str = Field(..., description="Witty GenZ hook")
-    hook_1: str = Field(..., description="Astrological reason, max 15 words")
-    hook_2: str = Field(..., description="CT action with persona language, max 20 words")
-    luck_score: int = Field(..., ge=0, le=100)
-    vibe_status: str = Field(..., description="Stellar, Ascending, Shaky, or Eclipse")
-    energy_emoji: str
-    zodiac_sign: str = Field(..., description="Sun sign based on date of birth")
-    time_lord: str = Field(default="Sun", description="Lord of the Year")
-    profection_house: int = Field(default=1, ge=1, le=12)
+# Traditional sign rulers for fallback mode
+_RULERS = {
+    "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury",
+    "Cancer": "Moon", "Leo": "Sun", "Virgo": "Mercury",
+    "Libra": "Venus", "Scorpio": "Mars", "Sagittarius": "Jupiter",
+    "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
+}
 
 
-class HoroscopeBack(BaseModel):
-    detailed_reading: str
-    hustle_alpha: str
-    shadow_warning: str
-    lucky_assets: LuckyAssets
-    time_lord_insight: str = Field(default="", description="Time Lord transit insight")
-    planetary_blame: str = Field(default="", description="Specific planetary attribution")
-    remedy: Optional[str] = Field(default=None)
-    cusp_alert: Optional[str] = Field(default=None)
+@lru_cache(maxsize=1024)
+def _build_x_context(
+    x_handle: Optional[str],
+    x_bio: Optional[str],
+    x_recent_tweets: Tuple[str, ...],
+    x_persona: Optional[str]
+) -> str:
+    """
+    Build the compact X context block for the prompt.
+    
+    Bio and tweets are squeezed, empty and duplicate tweets dropped, and at
+    most five tweets of 100 characters each kept.
+    """
+    x_context_parts = []
+    if x_handle:
+        x_context_parts.append(f"**Handle**: @{x_handle}")
+        bio = _squeeze_text(x_bio) if x_bio else ""
+        if bio:
+            x_context_parts.append(f"**Bio**: {bio}")
+        tweets = [t for t in dict.fromkeys(map(_squeeze_text, x_recent_tweets)) if t][:5]
+        if tweets:
+            tweets_formatted = "\n".join([
+                f"  - {t[:100]}{'...' if len(t) > 100 else ''}" for t in tweets
+            ])
+            x_context_parts.append(f"**Recent Tweets**:\n{tweets_formatted}")
+        if x_persona:
+            x_context_parts.append(f"**Inferred Persona**: {x_persona.upper()}")
+    
+    return "\n".join(x_context_parts) if x_context_parts else "No X context provided"
 
 
-class AstroCard(BaseModel):
-    front: HoroscopeFront
-    back: HoroscopeBack
-    ruling_planet: str
-    ruling_planet_theme: str
-    sect: str = Field(default="Diurnal")
-    cdo_summary: Optional[Dict[str, Any]] = Field(default=None)
+def _extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Recover the first JSON object embedded in free text.
+    
+    Scans left to right from each '{', tracking string and escape state, and
+    parses the first balanced span that decodes to an object. Handles fenced
+    blocks, chatty preambles and trailing commentary alike.
+    """
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = False
+        skip_to = 0
+        for token in _JSON_SCAN_RE.finditer(text, start):
+            position = token.start()
+            if position < skip_to:
+                continue  # Escaped character inside a string
+            char = token.group()
+            if in_string:
+                if char == "\\":
+                    skip_to = position + 2
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        parsed = orjson.loads(text[start:position + 1])
+                    except orjson.JSONDecodeError:
+                        break
+                    if isinstance(parsed, dict):
+                        return parsed
+                    break
+        start = text.find("{", start + 1)
+    return None
+
+
+# Try to import ephemeris services (optional - falls back gracefully).
+# The module is imported rather than its lazy ephemeris_service global, so
+# the EphemerisService is only built when the first chart needs it.
+try:
+    from . import ephemeris_service as ephemeris_module
+    from .astro_calculator import astro_calculator
+    CDO_ENABLED = ephemeris_module.SWISSEPH_AVAILABLE
+except ImportError as e:
+    logger.warning(f"Ephemeris services not available: {e}")
+    CDO_ENABLED = False
+    ephemeris_module = None
+    astro_calculator = None
 
 
 # --- Horoscope Service Implementation ---
@@ -106,55 +264,93 @@ class HoroscopeService:
     
     def __init__(self):
         try:
-            # Using Gemini 1.5-flash for speed and better JSON adherence
-            self.llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash", 
-                google_api_key=settings.google_api_key,
-                temperature=0.75,  # Slightly lower for more consistent output
-                max_retries=3
-            )
             self.output_parser = JsonOutputParser(pydantic_object=AstroCard)
-            self.prompt = ChatPromptTemplate.from_template(
-                template=SENIOR_ASTROLOGER_PROMPT,
-                partial_variables={"format_instructions": self.output_parser.get_format_instructions()}
-            )
-            self.chain = self.prompt | self.llm
+            self.format_instructions = FORMAT_INSTRUCTIONS
+            if settings.compressed_prompt_enabled:
+                self.prompt_template = SENIOR_ASTROLOGER_PROMPT_MIN
+                self.persona_tables = PERSONA_TABLES_MIN
+                self.full_persona_table = FULL_PERSONA_TABLE_MIN
+                self.examples_block = EXAMPLES_BLOCK_MIN
+            else:
+                self.prompt_template = SENIOR_ASTROLOGER_PROMPT
+                self.persona_tables = PERSONA_TABLES
+                self.full_persona_table = FULL_PERSONA_TABLE
+                self.examples_block = EXAMPLES_BLOCK
             
             self.cdo_enabled = CDO_ENABLED
+            # Identical requests currently being generated, so bursts of the
+            # same card share one LLM call
+            self._inflight: Dict[Tuple, asyncio.Future] = {}
+            # (transit minute, {chart: (cdo_json, cdo_summary)}); replaced
+            # wholesale when the minute rolls over so stale CDOs aren't kept
+            self._cdo_memo: Tuple[Optional[datetime], Dict[Tuple, Tuple[str, Dict[str, Any]]]] = (None, {})
+            # Caps concurrent Gemini calls so bursts queue here instead of
+            # tripping the API's rate limit and burning retries
+            self._llm_semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+            # Validated once here; _get_fallback_card copies it and patches
+            # the per-request Time Lord, sect and lucky assets
+            self._fallback_template = AstroCard(
+                front=HoroscopeCardFront(
+                    tagline="The stars are recalibrating... ✨",
+                    hook_1="Mercury retrograde in the cosmic servers",
+                    hook_2="HODL tight. The stars will align shortly.",
+                    luck_score=50,
+                    vibe_status="Shaky",
+                    energy_emoji="🔮",
+                    zodiac_sign="Unknown",
+                    time_lord="Sun",
+                    profection_house=1
+                ),
+                back=HoroscopeCardBack(
+                    detailed_reading="Mercury retrograde in the cosmic servers. Your chart is being processed through the ethers. Check back soon for your personalized reading.",
+                    hustle_alpha="Focus on grounding activities today. The stars will align shortly.",
+                    shadow_warning="Avoid making major decisions until the cosmic connection stabilizes.",
+                    lucky_assets={"number": "7", "color": "Gold", "power_hour": "11:11"},
+                    time_lord_insight="Your Time Lord is gathering cosmic data.",
+                    planetary_blame="Technical Mercury square Digital Saturn (Temporary)",
+                    remedy="Take 5 deep breaths and try again.",
+                    cusp_alert=None
+                ),
+                ruling_planet="Sun",
+                ruling_planet_theme="Sun",
+                sect="Diurnal",
+                cdo_summary=None
+            ).model_dump(exclude_none=True)
+            # Fallback cards cycle through pre-rolled lucky assets so an LLM
+            # outage doesn't re-roll them on every failed request
+            self._lucky_pool = itertools.cycle(
+                [self._roll_random_lucky_assets() for _ in range(LUCKY_POOL_SIZE)]
+            )
             logger.info(f"HoroscopeService initialized (CDO: {self.cdo_enabled})")
             
         except Exception as e:
             logger.error(f"Initialization failed: {e}")
             raise
     
+    @cached_property
+    def llm(self):
+        """Gemini client, built on first use so cache hits and fallbacks never load the SDK"""
+        # Imported here: langchain_google_genai pulls in the Google SDK, grpc
+        # and protobuf, which dominate import time
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        
+        # Using Gemini 1.5-flash for speed and better JSON adherence
+        return ChatGoogleGenerativeAI(
+            model="gemini-2.5-flash", 
+            google_api_key=settings.google_api_key,
+            temperature=0.75,  # Slightly lower for more consistent output
+            max_retries=3
+        )
+    
     def _parse_date(self, dob: str) -> datetime:
         """Parse date of birth string into datetime object"""
-        formats = [
-            "%B %d, %Y",      # April 20, 1995
-            "%b %d, %Y",      # Apr 20, 1995
-            "%Y-%m-%d",       # 1995-04-20
-            "%d/%m/%Y",       # 20/04/1995
-            "%m/%d/%Y",       # 04/20/1995
-            "%d-%m-%Y",       # 20-04-1995
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(dob.strip(), fmt)
-            except ValueError:
-                continue
-        
-        # Fallback: try to extract year/month/day with regex
-        match = re.search(r'(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})', dob)
-        if match:
-            day, month, year = match.groups()
-            return datetime(int(year), int(month), int(day))
-        
-        raise ValueError(f"Could not parse date: {dob}")
+        # Shared with request validation so both agree on what a DOB means
+        return parse_dob(dob)
     
     def _parse_time(self, birth_time: str) -> Tuple[int, int]:
         """Parse birth time string into (hour, minute) tuple"""
-        # Try 12-hour format (4:30 PM)
-        match = re.match(r'(\d{1,2}):(\d{2})\s*(AM|PM|am|pm)?', birth_time.strip())
+        # 12-hour (4:30 PM) or 24-hour (16:30) format
+        match = _TIME_RE.match(birth_time)
         if match:
             hour = int(match.group(1))
             minute = int(match.group(2))
@@ -168,11 +364,6 @@ class HoroscopeService:
             
             return hour, minute
         
-        # Try 24-hour format (16:30)
-        match = re.match(r'(\d{1,2}):(\d{2})', birth_time.strip())
-        if match:
-            return int(match.group(1)), int(match.group(2))
-        
         # Default to noon
         return 12, 0
     
@@ -181,44 +372,36 @@ class HoroscopeService:
         if current_date is None:
             current_date = date.today()
         
-        age = current_date.year - birth_date.year
-        if (current_date.month, current_date.day) < (birth_date.month, birth_date.day):
-            age -= 1
+        age = (
+            current_date.year - birth_date.year
+            - ((current_date.month, current_date.day) < (birth_date.month, birth_date.day))
+        )
         return max(0, age)
     
     def _get_age_segment(self, age: int) -> str:
         """Get life stage segment for appropriate advice tone"""
-        if age < 25:
-            return "EARLY_HUSTLE (Growth & Exploration)"
-        elif age < 35:
-            return "PIVOT_ERA (Career Building & Relationships)"
-        elif age < 50:
-            return "LEGACY_MODE (Stability & Leadership)"
-        else:
-            return "WISDOM_ERA (Reflection & Mentorship)"
+        return _AGE_SEGMENTS[bisect.bisect_right(_AGE_BREAKS, age)]
     
     def _build_cdo_context(
         self,
-        dob: str,
-        birth_time: str,
+        birth_datetime: datetime,
         latitude: float,
         longitude: float,
-        timezone_offset: float = 0.0
-    ) -> Tuple[Dict[str, Any], str]:
+        timezone_offset: float = 0.0,
+        transit_time: Optional[datetime] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Build Cosmic Data Object from birth data using ephemeris.
         
+        transit_time is a naive UTC datetime for the transits; defaults to now.
+        
         Returns:
-            Tuple of (cdo_dict, cdo_json_string)
+            Tuple of (cdo_dict projected for the prompt, cdo_summary_dict)
         """
-        if not self.cdo_enabled or ephemeris_service is None:
+        ephemeris_service = ephemeris_module.ephemeris_service if self.cdo_enabled else None
+        if ephemeris_service is None:
             raise RuntimeError("CDO not available - ephemeris service not initialized")
         
-        # Parse birth datetime
-        birth_date = self._parse_date(dob)
-        hour, minute = self._parse_time(birth_time)
-        birth_datetime = birth_date.replace(hour=hour, minute=minute)
-        
         # Calculate natal chart
         chart_data = ephemeris_service.calculate_chart(
             birth_datetime=birth_datetime,
@@ -229,7 +412,7 @@ class HoroscopeService:
         )
         
         # Get current transits
-        current_datetime = datetime.now()
+        current_datetime = transit_time or datetime.now(timezone.utc).replace(tzinfo=None)
         transit_planets = ephemeris_service.get_current_transits(
             current_datetime=current_datetime,
             latitude=latitude,
@@ -239,7 +422,7 @@ class HoroscopeService:
         # Build full CDO
         cdo = astro_calculator.build_cdo(
             chart_data=chart_data,
-            birth_date=birth_date.date(),
+            birth_date=birth_datetime.date(),
             current_date=current_datetime,
             transit_planets=transit_planets
         )
@@ -247,59 +430,96 @@ class HoroscopeService:
         # Build summary for prompt
         cdo_summary = astro_calculator.build_cdo_summary(cdo)
         
-        return cdo.model_dump(), cdo_summary.model_dump()
+        # Project the CDO down to what the prompt doesn't already carry;
+        # a tenth of a degree is plenty for the reading
+        cdo_dict = cdo.model_dump(exclude=_CDO_PROMPT_EXCLUDE)
+        for planet in cdo_dict["planets"]:
+            planet["sign_degree"] = round(planet["sign_degree"], 1)
+        
+        return cdo_dict, cdo_summary.model_dump()
     
-    def _get_fallback_zodiac(self, day: int, month: int) -> str:
-        """Get zodiac sign for fallback mode (tropical) - Corrected Date Ranges"""
-        # (End Day of Month, Sign)
-        zodiac_map = [
-            (19, "Capricorn"), (18, "Aquarius"), (20, "Pisces"), (19, "Aries"),
-            (20, "Taurus"), (20, "Gemini"), (22, "Cancer"), (22, "Leo"),
-            (22, "Virgo"), (23, "Libra"), (21, "Scorpio"), (21, "Sagittarius"),
-            (31, "Capricorn")
-        ]
-        # Adjust for array index (month - 1)
-        # If day is greater than cutoff, it's the next sign (which is stored in current month index in this map structure logic)
-        # Wait, let's fix the logic to be clearer.
+    def _build_cdo_prompt_context(
+        self,
+        birth_datetime: datetime,
+        latitude: float,
+        longitude: float,
+        timezone_offset: float,
+        transit_time: datetime
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the CDO and serialize it for the prompt (blocking; run off the event loop).
         
-        # Ranges based on user request:
-        # Aries: March 21 – April 19
-        # Taurus: April 20 – May 20
-        # Gemini: May 21 – June 21
-        # Cancer: June 22 – July 22
-        # Leo: July 23 – August 22
-        # Virgo: August 23 – September 22
-        # Libra: September 23 – October 23
-        # Scorpio: October 24 – November 22
-        # Sagittarius: November 23 – December 21
-        # Capricorn: December 22 – January 19
-        # Aquarius: January 20 – February 18
-        # Pisces: February 19 – March 20
+        Memoized per chart for the current transit minute only: transit_time
+        is the naive UTC minute the transits are computed for, so repeat
+        requests within that minute reuse the CDO without letting the
+        transiting Moon go stale.
         
-        if (month == 3 and day >= 21) or (month == 4 and day <= 19): return "Aries"
-        if (month == 4 and day >= 20) or (month == 5 and day <= 20): return "Taurus"
-        if (month == 5 and day >= 21) or (month == 6 and day <= 20): return "Gemini"
-        if (month == 6 and day >= 21) or (month == 7 and day <= 22): return "Cancer"
-        if (month == 7 and day >= 23) or (month == 8 and day <= 22): return "Leo"
-        if (month == 8 and day >= 23) or (month == 9 and day <= 22): return "Virgo"
-        if (month == 9 and day >= 23) or (month == 10 and day <= 22): return "Libra"
-        if (month == 10 and day >= 23) or (month == 11 and day <= 21): return "Scorpio"
-        if (month == 11 and day >= 22) or (month == 12 and day <= 21): return "Sagittarius"
-        if (month == 12 and day >= 22) or (month == 1 and day <= 19): return "Capricorn"
-        if (month == 1 and day >= 20) or (month == 2 and day <= 18): return "Aquarius"
-        if (month == 2 and day >= 19) or (month == 3 and day <= 20): return "Pisces"
+        Returns:
+            Tuple of (cdo_json_string, cdo_summary_dict); the dict is a copy
+        """
+        memo_minute, memo = self._cdo_memo
+        if memo_minute != transit_time:
+            memo = {}
+            self._cdo_memo = (transit_time, memo)
         
-        return "Aries" # Default should not happen with valid dates
+        chart_key = (birth_datetime, latitude, longitude, timezone_offset)
+        cached = memo.get(chart_key)
+        if cached is None:
+            # EphemerisService serializes its own swe calls
+            cdo_full, cdo_summary = self._build_cdo_context(
+                birth_datetime=birth_datetime,
+                latitude=latitude,
+                longitude=longitude,
+                timezone_offset=timezone_offset,
+                transit_time=transit_time
+            )
+            # Minified to save prompt tokens; sorted so identical charts
+            # render byte-identical prompts
+            cdo_json = orjson.dumps(cdo_full, default=str, option=orjson.OPT_SORT_KEYS).decode()
+            cached = (cdo_json, cdo_summary)
+            if len(memo) < CDO_MEMO_SIZE:
+                memo[chart_key] = cached
+        
+        cdo_json, cdo_summary = cached
+        return cdo_json, dict(cdo_summary)
+    
+    def _birth_cache_key(
+        self,
+        birth_datetime: Optional[datetime],
+        dob: str,
+        birth_time: str,
+        birth_place: str,
+        latitude: float,
+        longitude: float,
+        timezone_offset: float,
+        x_persona: Optional[str]
+    ) -> str:
+        """
+        Cache key for a request's birth data.
+        
+        Uses the parsed birth datetime and location (~1 km) so different
+        spellings of the same chart ("Apr 20, 1995" / "1995-04-20") share an
+        entry; falls back to the raw strings when the DOB can't be parsed.
+        The persona is included because it changes the prompt.
+        """
+        if birth_datetime is not None:
+            canonical = (
+                f"{birth_datetime.isoformat()}|{round(latitude, 2)}|"
+                f"{round(longitude, 2)}|{timezone_offset}|{x_persona or ''}"
+            )
+        else:
+            canonical = f"{dob}|{birth_time}|{birth_place}|{x_persona or ''}".lower()
+        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
     
-    def _get_fallback_ruler(self, sign: str) -> str:
+    @staticmethod
+    def _get_fallback_zodiac(day: int, month: int) -> str:
+        """Get zodiac sign for fallback mode (tropical) - Corrected Date Ranges"""
+        return _ZODIAC_BY_MONTH_DAY.get((month, day), "Aries")  # Default should not happen with valid dates
+    
+    @staticmethod
+    def _get_fallback_ruler(sign: str) -> str:
         """Get planetary ruler for fallback mode"""
-        rulers = {
-            "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury",
-            "Cancer": "Moon", "Leo": "Sun", "Virgo": "Mercury",
-            "Libra": "Venus", "Scorpio": "Mars", "Sagittarius": "Jupiter",
-            "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
-        }
-        return rulers.get(sign, "Sun")
+        return _RULERS.get(sign, "Sun")
     
     async def generate_horoscope(
         self,
@@ -330,75 +550,134 @@ class HoroscopeService:
         Returns:
             Tuple of (card_data_dict, was_cached, generation_mode)
         """
-        # Check cache first
-        if use_cache:
-            cache_key = f"{dob}_{birth_time}_{latitude}_{longitude}"
-            cached = cache_service.get(dob, birth_time, birth_place)
-            if cached:
-                return json.loads(cached), True, "cdo"
+        if not use_cache:
+            return await self._generate_horoscope(
+                dob, birth_time, birth_place, latitude, longitude, timezone_offset,
+                use_cache, x_handle, x_bio, x_recent_tweets, x_persona
+            )
         
-        # Parse birth date for age calculation
+        # Single-flight: a request identical to one already in progress waits
+        # for that result instead of paying for its own Gemini call
+        inflight_key = (
+            dob, birth_time, birth_place, latitude, longitude, timezone_offset,
+            x_handle, x_bio, tuple(x_recent_tweets or ()), x_persona
+        )
+        leader = self._inflight.get(inflight_key)
+        if leader is not None:
+            try:
+                card_dict, _, generation_mode = await asyncio.shield(leader)
+                return card_dict, True, generation_mode
+            except asyncio.CancelledError:
+                if not leader.cancelled():
+                    raise  # This request was cancelled, not the leader
+                # Leader failed; generate this one independently below
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = future
+        try:
+            result = await self._generate_horoscope(
+                dob, birth_time, birth_place, latitude, longitude, timezone_offset,
+                use_cache, x_handle, x_bio, x_recent_tweets, x_persona
+            )
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            if self._inflight.get(inflight_key) is future:
+                del self._inflight[inflight_key]
+        return result
+    
+    async def _generate_horoscope(
+        self,
+        dob: str,
+        birth_time: str,
+        birth_place: str,
+        latitude: float,
+        longitude: float,
+        timezone_offset: float,
+        use_cache: bool,
+        x_handle: Optional[str],
+        x_bio: Optional[str],
+        x_recent_tweets: Optional[list],
+        x_persona: Optional[str]
+    ) -> Tuple[Dict[str, Any], bool, str]:
+        """Generate the card for generate_horoscope (no in-flight coalescing)"""
+        # Parse birth date once; age, Sun sign, CDO and fallback all reuse it
+        today = date.today()
+        birth_date: Optional[datetime] = None
         try:
             birth_date = self._parse_date(dob)
-            age = self._calculate_age(birth_date.date())
+            age = self._calculate_age(birth_date.date(), today)
             age_segment = self._get_age_segment(age)
         except Exception as e:
             logger.warning(f"Date parsing failed: {e}, using defaults")
             age = 30
-            age_segment = "PIVOT_ERA (Career Building & Relationships)"
+            age_segment = _AGE_SEGMENTS[1]
+        
+        birth_datetime: Optional[datetime] = None
+        if birth_date is not None:
+            try:
+                hour, minute = self._parse_time(birth_time)
+                birth_datetime = birth_date.replace(hour=hour, minute=minute)
+            except Exception as e:
+                logger.warning(f"Birth time parsing failed: {e}, using fallback")
+        
+        # Check cache first, keyed on the parsed chart rather than the raw strings
+        birth_key = self._birth_cache_key(
+            birth_datetime, dob, birth_time, birth_place,
+            latitude, longitude, timezone_offset, x_persona
+        )
+        if use_cache:
+            cached = cache_service.get_by_key(birth_key)
+            if cached:
+                return orjson.loads(cached), True, "cdo"
         
         # Try CDO generation
         generation_mode = "cdo"
         cdo_json = "{}"
         cdo_summary = {}
         
-        if self.cdo_enabled and latitude != 0.0 and longitude != 0.0:
+        cdo_task = None
+        if (
+            self.cdo_enabled
+            and birth_datetime is not None
+            and latitude != 0.0
+            and longitude != 0.0
+        ):
+            # Ephemeris math and serialization are CPU-bound; run them on a
+            # worker thread so the event loop keeps serving other requests,
+            # and build the X context and Sun sign while the chart computes
+            cdo_task = asyncio.ensure_future(asyncio.to_thread(
+                self._build_cdo_prompt_context,
+                birth_datetime,
+                round(latitude, 4),
+                round(longitude, 4),
+                timezone_offset,
+                datetime.now(timezone.utc).replace(tzinfo=None, second=0, microsecond=0)
+            ))
+        
+        # Build enriched X context for personalization
+        x_context = _build_x_context(x_handle, x_bio, tuple(x_recent_tweets or ()), x_persona)
+        
+        # Compute Sun sign from DOB (independent of birth time)
+        if birth_date is not None:
+            sun_sign = self._get_fallback_zodiac(birth_date.day, birth_date.month)
+        else:
+            sun_sign = "Unknown"
+        
+        if cdo_task is not None:
             try:
-                cdo_full, cdo_summary = self._build_cdo_context(
-                    dob=dob,
-                    birth_time=birth_time,
-                    latitude=latitude,
-                    longitude=longitude,
-                    timezone_offset=timezone_offset
-                )
-                cdo_json = json.dumps(cdo_full, indent=2, default=str)
+                cdo_json, cdo_summary = await cdo_task
                 logger.info("CDO generated successfully")
             except Exception as e:
                 logger.warning(f"CDO generation failed, using fallback: {e}")
                 generation_mode = "fallback"
-                cdo_summary = self._build_fallback_summary(dob, birth_time, age)
+                cdo_summary = self._build_fallback_summary(birth_date, age)
         else:
             generation_mode = "fallback"
-            cdo_summary = self._build_fallback_summary(dob, birth_time, age)
-        
-        # Build enriched X context for personalization
-        x_context_parts = []
-        if x_handle:
-            x_context_parts.append(f"**Handle**: @{x_handle}")
-            if x_bio:
-                x_context_parts.append(f"**Bio**: {x_bio}")
-            if x_recent_tweets and len(x_recent_tweets) > 0:
-                tweets_formatted = "\n".join([f"  - {t[:100]}..." if len(t) > 100 else f"  - {t}" for t in x_recent_tweets[:5]])
-                x_context_parts.append(f"**Recent Tweets**:\n{tweets_formatted}")
-            if x_persona:
-                x_context_parts.append(f"**Inferred Persona**: {x_persona.upper()}")
-        
-        x_context = "\n".join(x_context_parts) if x_context_parts else "No X context provided"
-        
-
-        # Prepare asset lists for prompt
-        available_colors_list = list(ASSET_MAPPINGS.get("colors_to_tickers", {}).keys())
-        available_colors_str = ", ".join(available_colors_list)
-        
-        bullish_moods_str = ", ".join([f"{m['mood']} {m['emoji']}" for m in ASSET_MAPPINGS.get("bullish_moods", [])])
-        bearish_moods_str = ", ".join([f"{m['mood']} {m['emoji']}" for m in ASSET_MAPPINGS.get("bearish_moods", [])])
-
-        # Compute Sun sign from DOB (independent of birth time)
-        try:
-            sun_date = self._parse_date(dob)
-            sun_sign = self._get_fallback_zodiac(sun_date.day, sun_date.month)
-        except Exception:
-            sun_sign = "Unknown"
+            cdo_summary = self._build_fallback_summary(birth_date, age)
 
         # Build prompt variables
         prompt_vars = {
@@ -415,24 +694,30 @@ class HoroscopeService:
             "cusp_alert": f"**Cosmic Cusp Alert**: Ascendant on sign boundary" if cdo_summary.get("is_cusp") else "",
             "dignity_warning": cdo_summary.get("dignity_warning", ""),
             "x_context": x_context,
-            "available_colors": available_colors_str,
-            "bullish_moods": bullish_moods_str,
-            "bearish_moods": bearish_moods_str
+            # Only the known persona's row; anything else gets the full table
+            "persona_table": self.persona_tables.get((x_persona or "").lower(), self.full_persona_table),
+            # Examples go out on a sampled share of requests as a safety net
+            "examples_block": self.examples_block if random.random() < settings.prompt_examples_rate else "",
+            "available_colors": AVAILABLE_COLORS_STR,
+            "bullish_moods": BULLISH_MOODS_STR,
+            "bearish_moods": BEARISH_MOODS_STR,
+            "format_instructions": self.format_instructions
         }
         
+        prompt = render_prompt(self.prompt_template, **prompt_vars)
+        
         try:
             # Invoke AI
-            raw_output = await self.chain.ainvoke(prompt_vars)
+            async with self._llm_semaphore:
+                raw_output = await self.llm.ainvoke(prompt)
             
             # Parse response
             try:
                 card_data = self.output_parser.parse(raw_output.content)
             except:
-                # Fallback: extract JSON from markdown blocks
-                match = re.search(r'\{.*\}', raw_output.content, re.DOTALL)
-                if match:
-                    card_data = json.loads(match.group())
-                else:
+                # Fallback: pull the card object out of the surrounding text
+                card_data = _extract_json_object(raw_output.content)
+                if card_data is None:
                     raise OutputParserException("No JSON found in LLM response")
             
             # Fallback for missing hooks (common issue with some models)
@@ -460,12 +745,11 @@ class HoroscopeService:
                 
                 # Try simple case-insensitive match if direct fails
                 if not asset_info and color:
-                    for k, v in mapping.items():
-                        if k.lower() == color.lower():
-                            asset_info = v
-                            # Update color name to official one
-                            card_data["back"]["lucky_assets"]["color"] = k
-                            break
+                    canonical = _COLORS_LOWER_INDEX.get(color.lower())
+                    if canonical:
+                        asset_info = mapping[canonical]
+                        # Update color name to official one
+                        card_data["back"]["lucky_assets"]["color"] = canonical
                             
                 if asset_info:
                     card_data["back"]["lucky_assets"]["ticker"] = asset_info.get("ticker")
@@ -487,17 +771,17 @@ class HoroscopeService:
                         card_data["back"]["lucky_assets"]["emoji"] = asset_info.get("emoji")
                         card_data["back"]["lucky_assets"]["category"] = asset_info.get("category")
 
-            # Validate and enhance
-            validated_card = AstroCard(**card_data)
-            
             # Add CDO summary to response
-            card_dict = validated_card.model_dump()
             if cdo_summary:
-                card_dict["cdo_summary"] = cdo_summary
+                card_data["cdo_summary"] = cdo_summary
+            
+            # Validate once here; the route and the caches reuse this dump
+            card_dict = ASTRO_CARD_ADAPTER.validate_python(card_data).model_dump(exclude_none=True)
             
             # Cache result
             if use_cache:
-                cache_service.set(dob, birth_time, birth_place, json.dumps(card_dict))
+                card_json = orjson.dumps(card_dict).decode()
+                cache_service.set_by_key(birth_key, card_json)
             
             return card_dict, False, generation_mode
             
@@ -508,13 +792,12 @@ class HoroscopeService:
                 cdo_summary.get("sect", "Diurnal")
             ), False, "fallback"
     
-    def _build_fallback_summary(self, dob: str, birth_time: str, age: int) -> Dict[str, Any]:
+    def _build_fallback_summary(self, birth_date: Optional[datetime], age: int) -> Dict[str, Any]:
         """Build a basic summary when CDO is not available"""
-        try:
-            birth_date = self._parse_date(dob)
+        if birth_date is not None:
             zodiac = self._get_fallback_zodiac(birth_date.day, birth_date.month)
             ruler = self._get_fallback_ruler(zodiac)
-        except:
+        else:
             zodiac = "Aries"
             ruler = "Mars"
         
@@ -535,40 +818,24 @@ class HoroscopeService:
     
     def _get_fallback_card(self, time_lord: str, sect: str) -> Dict[str, Any]:
         """Generate fallback card when everything fails"""
-        return AstroCard(
-            front=HoroscopeFront(
-                tagline="The stars are recalibrating... ✨",
-                hook_1="Mercury retrograde in the cosmic servers",
-                hook_2="HODL tight. The stars will align shortly.",
-                luck_score=50,
-                vibe_status="Shaky",
-                energy_emoji="🔮",
-                zodiac_sign="Unknown",
-                time_lord=time_lord,
-                profection_house=1
-            ),
-            back=HoroscopeBack(
-                detailed_reading="Mercury retrograde in the cosmic servers. Your chart is being processed through the ethers. Check back soon for your personalized reading.",
-                hustle_alpha="Focus on grounding activities today. The stars will align shortly.",
-                shadow_warning="Avoid making major decisions until the cosmic connection stabilizes.",
-                lucky_assets=self._generate_random_lucky_assets(),
-                time_lord_insight="Your Time Lord is gathering cosmic data.",
-                planetary_blame="Technical Mercury square Digital Saturn (Temporary)",
-                remedy="Take 5 deep breaths and try again.",
-                cusp_alert=None
-            ),
-            ruling_planet=time_lord,
-            ruling_planet_theme=time_lord,
-            sect=sect,
-            cdo_summary=None
-        ).model_dump()
+        card = copy.deepcopy(self._fallback_template)
+        card["front"]["time_lord"] = time_lord
+        card["back"]["lucky_assets"] = self._generate_random_lucky_assets()
+        card["ruling_planet"] = time_lord
+        card["ruling_planet_theme"] = time_lord
+        card["sect"] = sect
+        return card
 
 
     def _generate_random_lucky_assets(self) -> Dict[str, Any]:
+        """Next lucky assets from the pre-rolled pool"""
+        return dict(next(self._lucky_pool))
+    
+    def _roll_random_lucky_assets(self) -> Dict[str, Any]:
         """Generate random lucky assets from mapping"""
         mapping = ASSET_MAPPINGS.get("colors_to_tickers", {})
-        if mapping:
-            color = random.choice(list(mapping.keys()))
+        if _COLOR_KEYS:
+            color = random.choice(_COLOR_KEYS)
             info = mapping[color]
             return {
                 "number": str(random.randint(1, 99)),
@@ -592,5 +859,20 @@ class HoroscopeService:
             "category": "crypto"
         }
 
-# Global service instance
-horoscope_service = HoroscopeService()
\ No newline at end of file
+# Global service instance, built on first use so importing this module
+# doesn't construct the Gemini client
+_horoscope_service: Optional[HoroscopeService] = None
+
+
+def get_horoscope_service() -> HoroscopeService:
+    """Return the shared HoroscopeService, creating it on first call"""
+    global _horoscope_service
+    if _horoscope_service is None:
+        _horoscope_service = HoroscopeService()
+    return _horoscope_service
+
+
+def __getattr__(name: str):
+    if name == "horoscope_service":
+        return get_horoscope_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")